@@ -1,19 +1,14 @@
 """Main orchestration logic for the multi-agent research platform."""
 from __future__ import annotations
 
+import functools
 import hashlib
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, TypedDict, Any
-
-import networkx as nx
-
-try:  # pragma: no cover - optional dependency
-    import matplotlib.pyplot as plt
-except ImportError:  # pragma: no cover - optional dependency
-    plt = None
-
-from langgraph.graph import StateGraph, END
+from typing import Dict, Any
 
 from src.agents import (
     DiscoveryAgent,
@@ -22,121 +17,117 @@ from src.agents import (
     ValidationAgent,
 )
 from src.agents.state import KnowledgeGraph, ResearchState
-from src.config import config, ResearchDepthConfig
+from src.config import get_config, ResearchDepthConfig
+from src.utils.llm_cache import LLMCache
 from src.utils.logger import default_logger as logger
 
 
+# networkx, matplotlib, and langgraph dominate cold-start time (matplotlib's
+# font-cache build alone can take seconds), so they are imported lazily by the
+# functions that need them rather than at module load.
+
+# Above this node count the pure-Python spring_layout physics loop dominates
+# visualisation wall time, so we hand layout off to igraph when available.
+_IGRAPH_LAYOUT_THRESHOLD = 200
+
+# Rendering more nodes than this produces an illegible figure while the layout
+# cost grows super-linearly, so the graph is pruned to its best-connected nodes.
+_MAX_RENDER_NODES = 500
+
+_HEADER_RULE = "=" * 80
+
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _now_iso() -> str:
+    """Single clock read for the timestamps written into state and reports."""
+
+    return datetime.now().isoformat(timespec="seconds")
+
+
+@functools.lru_cache(maxsize=1)
+def _import_plt() -> Any:
+    """Import matplotlib on first use, or return None if unavailable."""
+
+    try:  # pragma: no cover - optional dependency
+        import matplotlib
+
+        matplotlib.use("Agg")  # headless backend, safe to render off the main thread
+        import matplotlib.pyplot as plt
+
+        return plt
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _import_igraph() -> Any:
+    """Import igraph on first use, or return None if unavailable."""
+
+    try:  # pragma: no cover - optional dependency
+        import igraph
+
+        return igraph
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+
+
 def initialize_state(query: str, research_depth: str = "standard") -> ResearchState:
-    """Create an initial application state."""
+    """Create an initial application state.
+
+    Inputs here are trusted (a string query and a vetted depth literal), so
+    model_construct skips Pydantic's per-field validator dispatch while still
+    applying every default and default_factory.
+    """
 
-    return ResearchState(query=query, research_depth=research_depth)
+    return ResearchState.model_construct(query=query, research_depth=research_depth)
 
 
 def _build_agents(llm, depth_config: ResearchDepthConfig | None = None) -> Dict[str, object]:
     """Instantiate all specialised agents."""
         
     return {
-        "discovery": DiscoveryAgent(llm, config, depth_config),
+        "discovery": DiscoveryAgent(llm, get_config(), depth_config),
         "validation": ValidationAgent(llm, depth_config),
         "synthesis": SynthesisAgent(llm, depth_config),
         "reporter": ReporterAgent(llm, depth_config),
     }
 
 
-def _state_to_dict(state: ResearchState) -> Dict[str, Any]:
-    """Convert ResearchState Pydantic model to dict for LangGraph compatibility."""
-    # Use model_dump with mode="python" to get native Python types
-    # This ensures nested Pydantic models are converted to dicts
-    return state.model_dump(mode="python", exclude_none=False)
-
+def _create_graph_nodes(agents: Dict[str, object]) -> Dict[str, callable]:
+    """Create LangGraph node functions that wrap agent methods.
 
-def _dict_to_state(state_dict: Dict[str, Any]) -> ResearchState:
-    """Convert dict back to ResearchState Pydantic model."""
-    # Pydantic will automatically reconstruct nested models from dicts
-    # because of the type hints in ResearchState
-    return ResearchState.model_validate(state_dict)
+    Nodes receive the ``ResearchState`` model directly and return only the
+    delta produced by their agent; LangGraph merges the delta into the state
+    channels, so the full nested state is never re-serialised per hop.
+    """
 
+    def _make_node(name: str, agent_method: callable, final: bool = False) -> callable:
+        """Build one node wrapper; all four share the same error contract."""
+
+        def node(state: ResearchState) -> Dict[str, Any]:
+            logger.info("Running %s agent", name)
+            try:
+                updates = agent_method(state) or {}
+            except Exception:
+                logger.exception("%s agent failed", name.capitalize())
+                raise
+            updates["current_agent"] = name
+            if final:
+                updates["workflow_status"] = "completed"
+                updates["completed_at"] = _now_iso()
+                updates["current_agent"] = "complete"
+                logger.info("Pipeline completed successfully")
+            return updates
+
+        node.__name__ = f"{name}_node"
+        return node
 
-def _create_graph_nodes(agents: Dict[str, object]) -> Dict[str, callable]:
-    """Create LangGraph node functions that wrap agent methods."""
-    
-    def discovery_node(state_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Discovery agent node."""
-        logger.info("Running discovery agent")
-        state = _dict_to_state(state_dict)
-        state.current_agent = "discovery"
-        
-        try:
-            updates = agents["discovery"].discover(state) or {}
-            if isinstance(updates, dict):
-                state.update(updates)
-            return _state_to_dict(state)
-        except Exception as exc:
-            logger.exception("Discovery agent failed")
-            state.errors.append(f"discovery agent error: {exc}")
-            state.workflow_status = "failed"
-            raise
-    
-    def validation_node(state_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Validation agent node."""
-        logger.info("Running validation agent")
-        state = _dict_to_state(state_dict)
-        state.current_agent = "validation"
-        
-        try:
-            updates = agents["validation"].validate(state) or {}
-            if isinstance(updates, dict):
-                state.update(updates)
-            return _state_to_dict(state)
-        except Exception as exc:
-            logger.exception("Validation agent failed")
-            state.errors.append(f"validation agent error: {exc}")
-            state.workflow_status = "failed"
-            raise
-    
-    def synthesis_node(state_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Synthesis agent node."""
-        logger.info("Running synthesis agent")
-        state = _dict_to_state(state_dict)
-        state.current_agent = "synthesis"
-        
-        try:
-            updates = agents["synthesis"].synthesize(state) or {}
-            if isinstance(updates, dict):
-                state.update(updates)
-            return _state_to_dict(state)
-        except Exception as exc:
-            logger.exception("Synthesis agent failed")
-            state.errors.append(f"synthesis agent error: {exc}")
-            state.workflow_status = "failed"
-            raise
-    
-    def reporter_node(state_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Reporter agent node."""
-        logger.info("Running reporter agent")
-        state = _dict_to_state(state_dict)
-        state.current_agent = "reporter"
-        
-        try:
-            updates = agents["reporter"].report(state) or {}
-            if isinstance(updates, dict):
-                state.update(updates)
-            state.workflow_status = "completed"
-            state.completed_at = datetime.now().isoformat()
-            state.current_agent = "complete"
-            logger.info("Pipeline completed successfully")
-            return _state_to_dict(state)
-        except Exception as exc:
-            logger.exception("Reporter agent failed")
-            state.errors.append(f"reporter agent error: {exc}")
-            state.workflow_status = "failed"
-            raise
-    
     return {
-        "discovery": discovery_node,
-        "validation": validation_node,
-        "synthesis": synthesis_node,
-        "reporter": reporter_node,
+        "discovery": _make_node("discovery", agents["discovery"].discover),
+        "validation": _make_node("validation", agents["validation"].validate),
+        "synthesis": _make_node("synthesis", agents["synthesis"].synthesize),
+        "reporter": _make_node("reporter", agents["reporter"].report, final=True),
     }
 
 
@@ -144,41 +135,15 @@ def _build_research_graph(agents: Dict[str, object]) -> Any:
     """Build and compile the LangGraph state machine for research pipeline.
     
     Returns:
-        Compiled LangGraph that can be invoked with state dict.
+        Compiled LangGraph that can be invoked with a ResearchState.
     """
-    
-    # Define state schema as TypedDict for LangGraph
-    class ResearchStateDict(TypedDict):
-        """State schema for LangGraph - mirrors ResearchState fields."""
-        query: str
-        research_depth: str
-        user_id: str | None
-        raw_sources: List[Dict[str, Any]]
-        discovery_metadata: Dict[str, Any]
-        validated_sources: List[Dict[str, Any]]
-        validation_scores: List[Dict[str, Any]]
-        credibility_report: Dict[str, Any] | None
-        knowledge_graph: Dict[str, Any] | None
-        research_gaps: List[Dict[str, Any]]
-        consensus_findings: List[str]
-        contradictions: List[Dict[str, Any]]
-        key_concepts: List[str]
-        executive_summary: str
-        detailed_report: str
-        citation_map: Dict[str, Any] | None
-        visualizations: List[Dict[str, Any]]
-        source_quality_avg: float
-        citation_counts: Dict[str, Any]
-        conflicts_detected: List[Dict[str, Any]]
-        current_agent: str
-        workflow_status: str
-        errors: List[str]
-        synthesis_ready: bool
-        started_at: str
-        completed_at: str
-    
-    # Create graph
-    graph = StateGraph(ResearchStateDict)
+
+    from langgraph.graph import END, StateGraph
+
+    # ResearchState itself is the graph schema: LangGraph validates inputs
+    # once and merges node deltas per channel, so no mirror TypedDict and no
+    # per-node dict round trip are needed.
+    graph = StateGraph(ResearchState)
     
     # Create node functions
     nodes = _create_graph_nodes(agents)
@@ -189,7 +154,12 @@ def _build_research_graph(agents: Dict[str, object]) -> Any:
     graph.add_node("synthesis", nodes["synthesis"])
     graph.add_node("reporter", nodes["reporter"])
     
-    # Define sequential edges
+    # Define edges. The topology stays linear on purpose: validation consumes
+    # raw_sources from discovery, synthesis consumes validated_sources, and the
+    # reporter consumes the synthesis artefacts, so there is no pair of agents
+    # without a hard data dependency to fan out concurrently. Concurrency is
+    # instead applied inside the agents (parallel searches, batched LLM calls),
+    # where the independent I/O actually lives.
     graph.set_entry_point("discovery")
     graph.add_edge("discovery", "validation")
     graph.add_edge("validation", "synthesis")
@@ -200,20 +170,37 @@ def _build_research_graph(agents: Dict[str, object]) -> Any:
     return graph.compile()
 
 
-def _execute_pipeline(state: ResearchState, agents: Dict[str, object]) -> ResearchState:
+@functools.lru_cache(maxsize=1)
+def _shared_llm() -> LLMCache:
+    """Process-wide caching LLM proxy shared by all agents and runs."""
+
+    return LLMCache(get_config().get_llm())
+
+
+@functools.lru_cache(maxsize=4)
+def _compiled_graph_for(research_depth: str) -> Any:
+    """Return the compiled research graph for a depth level.
+
+    Agents and the compiled graph depend only on the depth preset, so one
+    instance per depth is built lazily and reused across runs; compiled
+    LangGraph graphs are immutable and reentrant for invoke.
+    """
+
+    depth_config = ResearchDepthConfig.get_depth_config(research_depth)
+    agents = _build_agents(_shared_llm(), depth_config)
+    return _build_research_graph(agents)
+
+
+def _execute_pipeline(state: ResearchState) -> ResearchState:
     """Run the sequential pipeline across all agents using LangGraph."""
 
-    # Build and compile the graph
-    compiled_graph = _build_research_graph(agents)
-    
-    # Convert state to dict for LangGraph
-    state_dict = _state_to_dict(state)
-    
-    # Execute the graph
+    compiled_graph = _compiled_graph_for(state.research_depth)
+
+    # Execute the graph; the output is the merged channel dict, validated
+    # back into a ResearchState exactly once.
     try:
-        final_state_dict = compiled_graph.invoke(state_dict)
-        # Convert back to ResearchState
-        return _dict_to_state(final_state_dict)
+        final_state_dict = compiled_graph.invoke(state)
+        return ResearchState.model_validate(final_state_dict)
     except Exception as exc:
         logger.exception("Pipeline execution failed")
         state.workflow_status = "failed"
@@ -221,60 +208,161 @@ def _execute_pipeline(state: ResearchState, agents: Dict[str, object]) -> Resear
         return state
 
 
-def _save_detailed_report(state: ResearchState, query: str) -> Path:
+def _query_id(query: str) -> str:
+    """Short stable identifier for a query, used in output file names."""
+
+    return hashlib.blake2s(query.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def _save_detailed_report(state: ResearchState, query_id: str) -> Path:
     """Persist the detailed report to disk."""
 
-    report_path = config.reports_dir / f"report_{hashlib.md5(query.encode()).hexdigest()[:8]}.txt"
+    report_path = get_config().reports_dir / f"report_{query_id}.txt"
     report_body = state.detailed_report or "No detailed report generated."
 
     header = (
-        "=" * 80
+        _HEADER_RULE
         + "\nDETAILED RESEARCH REPORT\n"
-        + "=" * 80
-        + f"\nQuery: {state.query}\nGenerated: {datetime.now():%Y-%m-%d %H:%M:%S}\n\n"
+        + _HEADER_RULE
+        + f"\nQuery: {state.query}\nGenerated: {time.strftime(_TS_FMT)}\n\n"
     )
 
-    report_path.write_text(header + report_body, encoding="utf-8")
+    # Write header and body separately so the full document is never
+    # concatenated into one temporary string.
+    with report_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        fh.write(header)
+        fh.write(report_body)
     logger.info("Detailed report saved to %s", report_path)
     return report_path
 
 
-def _visualize_knowledge_graph(knowledge_graph: KnowledgeGraph | None, query: str) -> Path | None:
+def _layout_positions(graph: "nx.Graph") -> Dict[str, Any]:
+    """Compute node positions, preferring igraph's C layout for large graphs."""
+
+    import networkx as nx
+
+    igraph = _import_igraph()
+    if igraph is not None and len(graph.nodes) > _IGRAPH_LAYOUT_THRESHOLD:
+        try:
+            ig_graph = igraph.Graph.from_networkx(graph)
+            layout = ig_graph.layout_fruchterman_reingold(niter=200)
+            names = ig_graph.vs["_nx_name"]
+            return {name: tuple(coords) for name, coords in zip(names, layout.coords)}
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("igraph layout failed, falling back to spring_layout: %s", exc)
+
+    return nx.spring_layout(graph, seed=42)
+
+
+def _knowledge_graph_hash(knowledge_graph: KnowledgeGraph) -> str:
+    """Stable content hash of everything the rendered image depends on.
+
+    Labels (drawn text) and types (colour split) must be part of the key:
+    two graphs with identical ids but different labels would otherwise
+    serve each other's cached PNG. Mirrors visualization._kg_content_key.
+    """
+
+    content = (
+        ",".join(
+            sorted(
+                f"{node.id}|{node.type}|{node.label}|{node.url or ''}"
+                for node in knowledge_graph.nodes
+            )
+        )
+        + "#"
+        + ",".join(
+            sorted(
+                f"{edge.source}-{edge.target}-{edge.relation}"
+                for edge in knowledge_graph.edges
+            )
+        )
+    )
+    return hashlib.blake2s(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _visualize_knowledge_graph(knowledge_graph: KnowledgeGraph | None, query_id: str) -> Path | None:
     """Render the knowledge graph to an image file if possible."""
 
     if not knowledge_graph or not knowledge_graph.nodes:
         logger.warning("Knowledge graph is empty; skipping visualisation")
         return None
 
+    # Same query -> same sources -> same graph: key the rendered PNG on the
+    # graph content so repeat runs skip matplotlib entirely.
+    visualisations_dir = get_config().visualisations_dir
+    output_path = visualisations_dir / f"kg_{query_id}.png"
+    cached_path = visualisations_dir / f"kg_content_{_knowledge_graph_hash(knowledge_graph)}.png"
+    if cached_path.exists():
+        if cached_path != output_path:
+            shutil.copyfile(cached_path, output_path)
+        logger.info("Knowledge graph visualisation served from cache: %s", cached_path)
+        return output_path
+
+    plt = _import_plt()
     if plt is None:
         logger.warning("matplotlib not installed; skipping knowledge graph visualisation")
         return None
 
+    import networkx as nx
+
     graph = nx.Graph()
-    for node in knowledge_graph.nodes:
-        graph.add_node(node.id, label=node.label, type=node.type, url=node.url)
-    for edge in knowledge_graph.edges:
-        graph.add_edge(edge.source, edge.target, relation=edge.relation)
+    graph.add_nodes_from(
+        (node.id, {"label": node.label, "type": node.type, "url": node.url})
+        for node in knowledge_graph.nodes
+    )
+    graph.add_edges_from(
+        (edge.source, edge.target, {"relation": edge.relation})
+        for edge in knowledge_graph.edges
+    )
 
     if not graph.nodes:
         return None
 
-    pos = nx.spring_layout(graph, seed=42)
-    concept_nodes = [n for n, data in graph.nodes(data=True) if data.get("type") == "concept"]
-    source_nodes = [n for n, data in graph.nodes(data=True) if data.get("type") == "source"]
-
-    plt.figure(figsize=(18, 12))
-    nx.draw_networkx_nodes(graph, pos, nodelist=concept_nodes, node_color="#4CAF50", node_size=1200, alpha=0.8)
-    nx.draw_networkx_nodes(graph, pos, nodelist=source_nodes, node_color="#FF6B6B", node_size=900, alpha=0.7)
-    nx.draw_networkx_edges(graph, pos, alpha=0.3)
-    nx.draw_networkx_labels(graph, pos, {n: graph.nodes[n]["label"][:40] for n in graph.nodes()}, font_size=8)
-
-    output_path = config.visualisations_dir / f"kg_{hashlib.md5(query.encode()).hexdigest()[:8]}.png"
-    plt.title("Research Knowledge Graph", fontsize=18)
-    plt.axis("off")
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
-    plt.close()
+    if graph.number_of_nodes() > _MAX_RENDER_NODES:
+        keep = sorted(graph.degree, key=lambda item: -item[1])[:_MAX_RENDER_NODES]
+        pruned = graph.subgraph(node_id for node_id, _ in keep).copy()
+        logger.warning(
+            "Knowledge graph pruned for rendering: %d -> %d nodes (top degree)",
+            graph.number_of_nodes(),
+            pruned.number_of_nodes(),
+        )
+        graph = pruned
+
+    pos = _layout_positions(graph)
+    concept_nodes: list[str] = []
+    source_nodes: list[str] = []
+    for node in knowledge_graph.nodes:
+        if node.id in graph:
+            (concept_nodes if node.type == "concept" else source_nodes).append(node.id)
+
+    from matplotlib.collections import LineCollection
+
+    # Use the object-oriented API so the figure is local to this call and the
+    # render can run on a worker thread without touching pyplot global state.
+    # Edges go into one LineCollection and each node family into one scatter
+    # call, so the Agg backend strokes a single batched artist instead of one
+    # path object per element.
+    fig, ax = plt.subplots(figsize=(18, 12))
+    if graph.edges:
+        segments = [(pos[u], pos[v]) for u, v in graph.edges()]
+        ax.add_collection(LineCollection(segments, colors="#888888", alpha=0.3, linewidths=1.0))
+    if concept_nodes:
+        xs, ys = zip(*(pos[n] for n in concept_nodes))
+        ax.scatter(xs, ys, s=1200, c="#4CAF50", alpha=0.8)
+    if source_nodes:
+        xs, ys = zip(*(pos[n] for n in source_nodes))
+        ax.scatter(xs, ys, s=900, c="#FF6B6B", alpha=0.7)
+    # Bind the attribute views once; NodeView.__getitem__ resolves through a
+    # couple of dict hops per lookup otherwise.
+    node_attrs = graph.nodes
+    nx.draw_networkx_labels(graph, pos, {n: node_attrs[n]["label"][:40] for n in node_attrs}, font_size=8, ax=ax)
+
+    ax.set_title("Research Knowledge Graph", fontsize=18)
+    ax.axis("off")
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300, bbox_inches="tight")
+    plt.close(fig)
+    shutil.copyfile(output_path, cached_path)
 
     logger.info("Knowledge graph visualisation saved to %s", output_path)
     return output_path
@@ -284,9 +372,9 @@ def _summarise_state(state: ResearchState) -> str:
     """Build a concise textual summary of the final state."""
 
     lines = [
-        "=" * 80,
+        _HEADER_RULE,
         "FINAL RESEARCH SUMMARY",
-        "=" * 80,
+        _HEADER_RULE,
         f"Query: {state.query}",
         f"Depth: {state.research_depth}",
         f"Sources discovered: {len(state.raw_sources)}",
@@ -297,7 +385,7 @@ def _summarise_state(state: ResearchState) -> str:
         f"Research gaps: {len(state.research_gaps)}",
         f"Contradictions: {len(state.contradictions)}",
         f"Errors: {len(state.errors)}",
-        "=" * 80,
+        _HEADER_RULE,
     ]
     return "\n".join(lines)
 
@@ -307,30 +395,36 @@ def run_research_pipeline(query: str, research_depth: str = "standard") -> Resea
 
     logger.info("Starting research pipeline | query=%s | depth=%s", query, research_depth)
 
-    llm = config.get_llm()
     state = initialize_state(query, research_depth)
-    
-    # Create depth configuration
+
+    # Log the depth configuration driving this run; agents themselves are
+    # built (once per depth) inside _compiled_graph_for.
     depth_config = ResearchDepthConfig.get_depth_config(research_depth)
     logger.info("Depth config: arxiv=%d, web=%d, scholar=%d, validation_min=%d",
                 depth_config.max_arxiv_results,
                 depth_config.max_web_results,
                 depth_config.max_semantic_scholar_results,
                 depth_config.validation_min_score)
-    
-    agents = _build_agents(llm, depth_config)
 
     try:
-        state = _execute_pipeline(state, agents)
+        state = _execute_pipeline(state)
     except Exception:  # already logged within _run_agent
         logger.error("Pipeline terminated early due to errors")
         return state
-    
+
+    state.discovery_metadata["llm_cache"] = _shared_llm().stats()
+
     summary = _summarise_state(state)
     logger.info("\n%s", summary)
 
-    _save_detailed_report(state, query)
-    _visualize_knowledge_graph(state.knowledge_graph, query)
+    # The report write and the matplotlib render are independent; overlap the
+    # disk I/O with the rasterisation instead of serialising the tail.
+    query_id = _query_id(query)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report_future = executor.submit(_save_detailed_report, state, query_id)
+        viz_future = executor.submit(_visualize_knowledge_graph, state.knowledge_graph, query_id)
+        report_future.result()
+        viz_future.result()
     return state
     
 
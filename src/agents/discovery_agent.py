@@ -4,11 +4,14 @@ Discovery Agent - responsible for gathering initial research material.
 from __future__ import annotations
 
 import hashlib
+import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
 import arxiv
 import requests
+from requests.adapters import HTTPAdapter, Retry
 
 try:
     from tavily import TavilyClient  # type: ignore
@@ -18,6 +21,80 @@ except ImportError:  # pragma: no cover - optional dependency
 from src.agents.state import ResearchSource, ResearchState
 from src.config import ResearchConfig, ResearchDepthConfig
 from src.utils.logger import default_logger as logger
+from src.utils.search_cache import SearchCache
+
+# Providers move at very different speeds: arXiv updates at most daily,
+# scholarly metadata drifts over hours, and web results go stale quickest.
+_CACHE_TTLS = {
+    "arxiv": 24 * 3600,
+    "web": 3600,
+    "semantic_scholar": 6 * 3600,
+}
+
+# Compiled once; deduplicate_sources strips punctuation per source in a loop.
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+class _SourceDeduplicator:
+    """Incremental deduplication over successive provider batches.
+
+    Keeping the dedup state running — rather than deduping once at the end
+    of discovery — means the unique count is accurate after every provider,
+    so discover() can decide mid-flight whether the remaining providers or
+    the reformulation pass are still worth calling.
+    """
+
+    _JACCARD_THRESHOLD = 0.85
+
+    def __init__(self) -> None:
+        self._unique: Dict[str, ResearchSource] = {}
+        self._seen_urls: set[str] = set()
+        self._kept_shingles: List[set[str]] = []
+        self._block_index: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._unique)
+
+    def add(self, sources: List[ResearchSource]) -> None:
+        """Fold a batch of sources into the running unique set."""
+
+        for source in sources:
+            url_key = source.url.lower().rstrip("/") if source.url else ""
+            if url_key and url_key in self._seen_urls:
+                continue
+            title_key = _PUNCT_RE.sub("", source.title.lower()).strip()[:80]
+            if not title_key or title_key in self._unique:
+                continue
+
+            text = f"{title_key} {source.summary[:200].lower()}"
+            shingles = DiscoveryAgent._shingles(text)
+            block_keys = sorted(shingles)[:2]
+
+            candidates: set[int] = set()
+            for key in block_keys:
+                candidates.update(self._block_index.get(key, ()))
+            is_near_dup = False
+            for idx in candidates:
+                other = self._kept_shingles[idx]
+                overlap = len(shingles & other)
+                if overlap and overlap / len(shingles | other) >= self._JACCARD_THRESHOLD:
+                    is_near_dup = True
+                    break
+            if is_near_dup:
+                continue
+
+            kept_idx = len(self._kept_shingles)
+            self._kept_shingles.append(shingles)
+            for key in block_keys:
+                self._block_index.setdefault(key, []).append(kept_idx)
+            self._unique[title_key] = source
+            if url_key:
+                self._seen_urls.add(url_key)
+
+    def unique(self) -> List[ResearchSource]:
+        """Sources kept so far, in first-seen order."""
+
+        return list(self._unique.values())
 
 
 class DiscoveryAgent:
@@ -28,10 +105,49 @@ class DiscoveryAgent:
         self.config = config
         self.depth_config = depth_config
         self.sources_searched: List[str] = []
+        self._cache = SearchCache(config.cache_dir / "discovery")
+        # One page covers every depth preset (max 15 results), so a large
+        # page size avoids the client's default 3 s inter-page pauses.
+        self._arxiv_client = arxiv.Client(page_size=100, delay_seconds=0.0, num_retries=3)
+        # Memoized query reformulations: identical queries within a session
+        # skip the LLM round-trip entirely.
+        self._reformulation_cache: Dict[str, List[str]] = {}
+
+        # Keep-alive session: reformulated queries hit Semantic Scholar
+        # several times per run, and a pooled connection skips the TCP+TLS
+        # handshake on every call after the first.
+        self._http = requests.Session()
+        self._http.headers["User-Agent"] = "multi-agent-research-insight/1.0"
+        self._http.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                ),
+            ),
+        )
 
     def _log_phase(self, message: str) -> None:
         logger.info("[Discovery] %s", message)
 
+    def _cached_sources(self, provider: str, query: str, limit: int) -> List[ResearchSource] | None:
+        """Fetch a fresh-enough cached result list for a provider query."""
+
+        payload = self._cache.get(provider, query, limit, _CACHE_TTLS[provider])
+        if payload is None:
+            return None
+        return [ResearchSource(**item) for item in payload]
+
+    def _store_sources(self, provider: str, query: str, limit: int, results: List[ResearchSource]) -> None:
+        """Persist non-empty provider results; failures stay uncached."""
+
+        if results:
+            self._cache.put(provider, query, limit, [source.model_dump() for source in results])
+
     def search_arxiv(self, query: str, max_results: int | None = None) -> List[ResearchSource]:
         """Search arXiv for relevant publications."""
 
@@ -42,6 +158,11 @@ class DiscoveryAgent:
                 else self.config.search.max_arxiv_results
             )
 
+        cached = self._cached_sources("arxiv", query, max_results)
+        if cached is not None:
+            self.sources_searched.append("arxiv")
+            return cached
+
         try:
             search = arxiv.Search(
                 query=query,
@@ -50,7 +171,7 @@ class DiscoveryAgent:
             )
 
             results: List[ResearchSource] = []
-            for paper in search.results():
+            for paper in self._arxiv_client.results(search):
                 arxiv_id = paper.entry_id.split("/")[-1]
                 # Ensure URL is always available: use pdf_url, entry_id, or construct from arxiv_id
                 url = paper.pdf_url or paper.entry_id or f"https://arxiv.org/abs/{arxiv_id}"
@@ -60,8 +181,9 @@ class DiscoveryAgent:
                         id=f"arxiv_{arxiv_id}",
                         title=paper.title or "",
                         authors=[author.name for author in paper.authors],
+                        # summary already carries the abstract; duplicating it
+                        # into full_text doubles per-source string memory.
                         summary=paper.summary or "",
-                        full_text=paper.summary or "",
                         url=url,
                         published=paper.published.strftime("%Y-%m-%d") if paper.published else "",
                         categories=list(paper.categories),
@@ -74,6 +196,7 @@ class DiscoveryAgent:
                 )
 
             self.sources_searched.append("arxiv")
+            self._store_sources("arxiv", query, max_results, results)
             logger.info("arXiv: %d papers retrieved", len(results))
             return results
         except Exception as exc:  # pylint: disable=broad-except
@@ -90,6 +213,11 @@ class DiscoveryAgent:
                 else self.config.search.max_web_results
             )
 
+        cached = self._cached_sources("web", query, num_results)
+        if cached is not None:
+            self.sources_searched.append("web")
+            return cached
+
         try:
             if TavilyClient is None:
                 logger.warning("tavily package not installed; skipping web search.")
@@ -118,10 +246,9 @@ class DiscoveryAgent:
                     
                 formatted.append(
                     ResearchSource(
-                        id=f"web_{hashlib.md5(url.encode()).hexdigest()[:8]}",
+                        id=f"web_{hashlib.blake2b(url.encode(), digest_size=4).hexdigest()}",
                         title=result.get("title", "No title"),
                         summary=result.get("content", ""),
-                        full_text=result.get("content", ""),
                         url=url,
                         source_type="web",
                         metadata={
@@ -132,6 +259,7 @@ class DiscoveryAgent:
                 )
 
             self.sources_searched.append("web")
+            self._store_sources("web", query, num_results, formatted)
             logger.info("Web search: %d results", len(formatted))
             return formatted
         except Exception as exc:  # pylint: disable=broad-except
@@ -148,8 +276,13 @@ class DiscoveryAgent:
                 else self.config.search.max_semantic_scholar_results
             )
 
+        cached = self._cached_sources("semantic_scholar", query, limit)
+        if cached is not None:
+            self.sources_searched.append("semantic_scholar")
+            return cached
+
         try:
-            response = requests.get(
+            response = self._http.get(
                 "https://api.semanticscholar.org/graph/v1/paper/search",
                 params={
                     "query": query,
@@ -163,12 +296,15 @@ class DiscoveryAgent:
             logger.warning("Semantic Scholar request failed: %s", exc)
             return []
 
-        data = response.json()
+        # Parse the raw bytes directly: the API always returns UTF-8 JSON,
+        # and response.json() would first run charset detection over the
+        # whole body before decoding.
+        data = json.loads(response.content)
         papers = data.get("data", [])
         results: List[ResearchSource] = []
 
         for paper in papers:
-            paper_id = hashlib.md5(paper.get("title", "").encode()).hexdigest()[:8]
+            paper_id = hashlib.blake2b(paper.get("title", "").encode(), digest_size=4).hexdigest()
             published = paper.get("publicationDate") or paper.get("year")
             # Ensure URL is always available: use provided URL or construct from paperId if available
             paper_url = paper.get("url") or ""
@@ -196,12 +332,17 @@ class DiscoveryAgent:
             )
 
         self.sources_searched.append("semantic_scholar")
+        self._store_sources("semantic_scholar", query, limit, results)
         logger.info("Semantic Scholar: %d papers", len(results))
         return results
 
     def reformulate_query(self, query: str) -> List[str]:
         """Generate alternative search queries with the backing LLM."""
 
+        cached = self._reformulation_cache.get(query)
+        if cached is not None:
+            return list(cached)
+
         prompt = (
             f'Generate 2 alternative search queries for "{query}".\n'
             "Keep the meaning but change wording. One query per line."
@@ -209,22 +350,41 @@ class DiscoveryAgent:
 
         try:
             response = self.llm.invoke(prompt)
-            alternatives = [line.strip() for line in response.content.splitlines() if line.strip()]
-            return alternatives[:2]
+            alternatives = [line.strip() for line in response.content.splitlines() if line.strip()][:2]
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning("Query reformulation failed: %s", exc)
             return []
 
+        if alternatives:
+            if len(self._reformulation_cache) >= 512:
+                self._reformulation_cache.pop(next(iter(self._reformulation_cache)))
+            self._reformulation_cache[query] = alternatives
+        return list(alternatives)
+
+    @staticmethod
+    def _shingles(text: str, size: int = 4) -> set[str]:
+        """Character shingles used for near-duplicate comparison."""
+
+        if len(text) < size:
+            return {text} if text else set()
+        return {text[i : i + size] for i in range(len(text) - size + 1)}
+
     @staticmethod
     def deduplicate_sources(sources: List[ResearchSource]) -> List[ResearchSource]:
-        """Deduplicate sources based on normalised titles."""
+        """Deduplicate sources based on URLs, titles, and near-duplicate text.
 
-        unique: Dict[str, ResearchSource] = {}
-        for source in sources:
-            title_key = re.sub(r"[^\w\s]", "", source.title.lower()).strip()[:80]
-            if title_key and title_key not in unique:
-                unique[title_key] = source
-        return list(unique.values())
+        Different providers often return the same document with slightly
+        different titles but identical URLs; dropping those here saves one
+        LLM relevance call per duplicate during validation. On top of the
+        exact keys, a shingle-Jaccard pass collapses near-duplicates such as
+        "A Survey of Transformers" vs "A survey on transformers". Candidate
+        pairs are found through a blocking index on each source's two
+        smallest shingles, keeping the comparison count close to linear.
+        """
+
+        deduper = _SourceDeduplicator()
+        deduper.add(sources)
+        return deduper.unique()
 
     def discover(self, state: ResearchState) -> Dict[str, object]:
         """Execute the discovery pipeline and return updates to the state."""
@@ -233,41 +393,84 @@ class DiscoveryAgent:
         query = state.query
         depth = state.research_depth
 
-        sources: List[ResearchSource] = []
-        sources.extend(self.search_arxiv(query))
-        sources.extend(self.search_web(query))
-        sources.extend(self.search_semantic_scholar(query))
+        # Agents are cached per depth and reused across runs, so the provider
+        # log must start empty or run N would report every provider any
+        # earlier run touched.
+        self.sources_searched = []
+
+        # Dedup runs incrementally so the unique count is accurate after
+        # every provider batch and the skip decisions below are honest.
+        deduper = _SourceDeduplicator()
+        total_found = 0
+
+        # arXiv and web are independent network calls; run them concurrently
+        # so discovery waits for the slowest, not the sum.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.search_arxiv, query),
+                executor.submit(self.search_web, query),
+            ]
+            for future in futures:
+                batch = future.result()
+                total_found += len(batch)
+                deduper.add(batch)
+
+        # Quick runs only ever report max_sources_in_report sources; when the
+        # first two providers already cover that quota the Semantic Scholar
+        # call buys nothing, and the cheapest request is the one never sent.
+        quota = self.depth_config.max_sources_in_report if self.depth_config else 0
+        if depth == "quick" and quota and len(deduper) >= quota:
+            self._log_phase(
+                f"Quota met ({len(deduper)}/{quota} unique); skipping Semantic Scholar"
+            )
+        else:
+            batch = self.search_semantic_scholar(query)
+            total_found += len(batch)
+            deduper.add(batch)
 
-        # Check if reformulated searches should be run based on depth_config
+        # Check if reformulated searches should be run based on depth_config.
+        # Conditions count unique sources, not raw hits, so overlapping
+        # providers cannot mask a thin result set.
         should_run_reformulated = False
         if self.depth_config:
             if self.depth_config.enable_reformulated_searches:
                 condition = self.depth_config.reformulated_search_condition
                 if condition == "always":
                     should_run_reformulated = True
-                elif condition == "if_less_than_15" and len(sources) < 15:
+                elif condition == "if_less_than_15" and len(deduper) < 15:
                     should_run_reformulated = True
         else:
             # Fallback to old behavior for backward compatibility
-            if depth in {"standard", "deep"} and len(sources) < 15:
+            if depth in {"standard", "deep"} and len(deduper) < 15:
                 should_run_reformulated = True
 
         if should_run_reformulated:
             self._log_phase("Running reformulated searches")
-            for alt_query in self.reformulate_query(query):
+            alt_queries = self.reformulate_query(query)
+            for alt_query in alt_queries:
                 self._log_phase(f"Alternative query: {alt_query}")
-                sources.extend(self.search_arxiv(alt_query, max_results=3))
-                sources.extend(self.search_semantic_scholar(alt_query, limit=3))
-
-        unique_sources = self.deduplicate_sources(sources)
+            if alt_queries:
+                # Fan out all alt-query searches in one batch as well.
+                with ThreadPoolExecutor(max_workers=2 * len(alt_queries)) as executor:
+                    futures = []
+                    for alt_query in alt_queries:
+                        futures.append(executor.submit(self.search_arxiv, alt_query, 3))
+                        futures.append(executor.submit(self.search_semantic_scholar, alt_query, 3))
+                    for future in futures:
+                        batch = future.result()
+                        total_found += len(batch)
+                        deduper.add(batch)
+
+        unique_sources = deduper.unique()
         self._log_phase(f"Discovery complete: {len(unique_sources)} unique sources")
 
         return {
             "raw_sources": unique_sources,
             "discovery_metadata": {
-                "total_found": len(sources),
+                "total_found": total_found,
                 "unique_sources": len(unique_sources),
                 "sources_searched": sorted(set(self.sources_searched)),
+                "search_cache": self._cache.stats(),
                 "timestamp": state.started_at,
             },
         }
@@ -4,12 +4,73 @@ Reporter Agent - generates human-readable outputs and visualisations.
 from __future__ import annotations
 
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import Dict, List
 
 from src.agents.state import CitationMap, ResearchState
 from src.config import ResearchDepthConfig
 from src.utils.logger import default_logger as logger
 
+# Post-processing pattern for stripping LLM-added reference sections,
+# compiled once at import instead of parsed on every report.
+#
+# One alternation scans the report a single time instead of running two
+# separate passes. The "ref" branch matches section headers such as
+# "## References", "**Sources**" or "Bibliography:"; the "cite" branch
+# matches lines that look like "[1] Some title". Taking the earliest
+# match of either gives the same cut point the two sequential searches
+# produced. _SOURCES_HEADER_RE then finds a bare "Sources:"/"References:"
+# line preceding a headerless citation list.
+_STRIP_RE = re.compile(
+    r"(?P<ref>(\n|^)(\*{0,2}#{0,2}\s*)?(References?|Sources?|Bibliography)(\*{0,2}#{0,2})?\s*:?\s*\n)"
+    r"|(?P<cite>\n\s*\[\d+\]\s+[^\n]+)",
+    re.IGNORECASE,
+)
+_SOURCES_HEADER_RE = re.compile(r"(Sources?|References?)\s*:?\s*$", re.IGNORECASE | re.MULTILINE)
+
+_BRIEF_SECTIONS = (
+    "Sections:\n"
+    "1. Executive Summary\n"
+    "2. Key Findings\n"
+    "3. Conclusion\n"
+)
+_STANDARD_SECTIONS = (
+    "Sections:\n"
+    "1. Executive Summary\n"
+    "2. Key Findings\n"
+    "3. Notable Insights\n"
+    "4. Research Gaps & Future Directions\n"
+    "5. Conflicting Evidence\n"
+    "6. Conclusion\n"
+)
+_DETAILED_SECTIONS = (
+    "Sections:\n"
+    "1. Executive Summary\n"
+    "2. Key Findings\n"
+    "3. Notable Insights\n"
+    "4. Research Gaps & Future Directions\n"
+    "5. Conflicting Evidence\n"
+    "6. Methodology & Sources\n"
+    "7. Conclusion\n"
+)
+
+# Per-detail-level policies, looked up once per call instead of walking
+# parallel if/elif chains in both generators.
+# Summary: (max_findings, max_gaps, sentence_count)
+_SUMMARY_POLICY = {
+    "brief": (3, 2, "2-3"),
+    "standard": (5, 3, "3-4"),
+    "detailed": (7, 5, "5-6"),
+}
+# Report: (section list, concepts limit)
+_REPORT_POLICY = {
+    "brief": (_BRIEF_SECTIONS, 5),
+    "standard": (_STANDARD_SECTIONS, 10),
+    "detailed": (_DETAILED_SECTIONS, 15),
+}
+
 
 class ReporterAgent:
     """Agent responsible for compiling reports and summaries."""
@@ -19,25 +80,21 @@ class ReporterAgent:
         self.depth_config = depth_config
 
     def generate_executive_summary(self, state: ResearchState) -> str:
+        # Nothing to summarise means the LLM would only produce boilerplate;
+        # skip the round-trip entirely.
+        if not state.consensus_findings and not state.research_gaps:
+            return f"No significant findings yet for '{state.query}'."
+
         detail_level = (
             self.depth_config.report_detail_level
             if self.depth_config
             else "standard"
         )
         
-        if detail_level == "brief":
-            max_findings = 3
-            max_gaps = 2
-            sentence_count = "2-3"
-        elif detail_level == "detailed":
-            max_findings = 7
-            max_gaps = 5
-            sentence_count = "5-6"
-        else:  # standard
-            max_findings = 5
-            max_gaps = 3
-            sentence_count = "3-4"
-        
+        max_findings, max_gaps, sentence_count = _SUMMARY_POLICY.get(
+            detail_level, _SUMMARY_POLICY["standard"]
+        )
+
         consensus = state.consensus_findings[:max_findings]
         gaps = [gap.get("gap", "") for gap in state.research_gaps[:max_gaps]]
 
@@ -69,48 +126,25 @@ class ReporterAgent:
         )
         
         sources = state.validated_sources[:max_sources]
+        if not sources:
+            return (
+                f"# Research Report: {state.query}\n\n"
+                "No validated sources were available to report on."
+            )
+
         consensus = state.consensus_findings
         gaps = state.research_gaps
         contradictions = state.contradictions
         concepts = state.key_concepts
 
         sources_text = "\n".join(
-            f"[{idx+1}] {source.get('title', '')} - {source.get('summary', '')[:200]}"
-            for idx, source in enumerate(sources)
+            f"[{idx}] {source.get('title', '')} - {source.get('summary', '')[:200]}"
+            for idx, source in enumerate(sources, 1)
         )
 
-        if detail_level == "brief":
-            sections = (
-                "Sections:\n"
-                "1. Executive Summary\n"
-                "2. Key Findings\n"
-                "3. Conclusion\n"
-            )
-            concepts_text = f"KEY CONCEPTS: {', '.join(concepts[:5])}\n\n"
-        elif detail_level == "detailed":
-            sections = (
-                "Sections:\n"
-                "1. Executive Summary\n"
-                "2. Key Findings\n"
-                "3. Notable Insights\n"
-                "4. Research Gaps & Future Directions\n"
-                "5. Conflicting Evidence\n"
-                "6. Methodology & Sources\n"
-                "7. Conclusion\n"
-            )
-            concepts_text = f"KEY CONCEPTS: {', '.join(concepts[:15])}\n\n"
-        else:  # standard
-            sections = (
-                "Sections:\n"
-                "1. Executive Summary\n"
-                "2. Key Findings\n"
-                "3. Notable Insights\n"
-                "4. Research Gaps & Future Directions\n"
-                "5. Conflicting Evidence\n"
-                "6. Conclusion\n"
-            )
-            concepts_text = f"KEY CONCEPTS: {', '.join(concepts[:10])}\n\n"
-        
+        sections, max_concepts = _REPORT_POLICY.get(detail_level, _REPORT_POLICY["standard"])
+        concepts_text = f"KEY CONCEPTS: {', '.join(concepts[:max_concepts])}\n\n"
+
         # Add instruction to NOT create References section
         no_references_note = (
             "\n\nIMPORTANT: Do NOT create a 'References' or 'Sources' section. "
@@ -127,9 +161,11 @@ class ReporterAgent:
             f"how that domain relates to '{state.query}'.\n\n"
             f"SOURCES:\n{sources_text}\n\n"
             "CONSENSUS FINDINGS:\n"
-            f"{chr(10).join('- ' + finding for finding in consensus)}\n\n"
+            + "\n".join(f"- {finding}" for finding in consensus)
+            + "\n\n"
             "RESEARCH GAPS:\n"
-            f"{chr(10).join('- ' + gap.get('gap', '') for gap in gaps)}\n\n"
+            + "\n".join(f"- {gap.get('gap', '')}" for gap in gaps)
+            + "\n\n"
             f"{concepts_text}"
             f"{sections}"
             f"{no_references_note}"
@@ -139,100 +175,135 @@ class ReporterAgent:
             response = self.llm.invoke(prompt)
             report = response.content
             
-            # Remove any References or Sources section that LLM might have added
-            # Look for common patterns: "References", "Sources", "Bibliography", etc.
-            # Pattern to match section headers like "## References", "**References**", "Sources:", etc.
-            # This pattern matches:
-            # - Markdown headers: ## References, **References**, etc.
-            # - Plain text: Sources:, References:, etc.
-            references_pattern = r'(?i)(\n|^)(\*{0,2}#{0,2}\s*)?(References?|Sources?|Bibliography)(\*{0,2}#{0,2})?\s*:?\s*\n'
-            # Find where References/Sources section starts
-            match = re.search(references_pattern, report)
-            if match:
+            # Remove any References/Sources section or headerless citation
+            # list the LLM might have added; one scan finds whichever
+            # appears first, which matches what the two sequential
+            # searches used to cut.
+            match = _STRIP_RE.search(report)
+            if match and match.lastgroup == "ref":
                 # Remove everything from References/Sources section onwards
                 report = report[:match.start()].rstrip()
                 logger.info("Reporter: removed LLM-generated References/Sources section")
-            
-            # Also check for citation lists that might appear without a header
-            # Pattern to match lines starting with [1], [2], [10], etc. (citation format)
-            # This matches any line that starts with [number] followed by text
-            citation_list_pattern = r'\n\s*\[\d+\]\s+[^\n]+'
-            citation_match = re.search(citation_list_pattern, report)
-            if citation_match:
+            elif match:
                 # Find the start of the citation list (could be after "Sources:" or standalone)
                 # Look backwards to find if there's a "Sources:" header before it
-                before_citation = report[:citation_match.start()]
-                sources_header_match = re.search(r'(?i)(Sources?|References?)\s*:?\s*$', before_citation, re.MULTILINE)
-                
+                before_citation = report[:match.start()]
+                sources_header_match = _SOURCES_HEADER_RE.search(before_citation)
+
                 if sources_header_match:
                     # Remove from "Sources:" header onwards
                     report = report[:sources_header_match.start()].rstrip()
                 else:
                     # Remove from first citation onwards
-                    report = report[:citation_match.start()].rstrip()
+                    report = report[:match.start()].rstrip()
                 logger.info("Reporter: removed LLM-generated citation list")
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning("Detailed report generation failed: %s", exc)
             return "Detailed report generation failed."
 
-        # Ensure report ends with proper spacing before adding sections
-        if not report.endswith("\n\n"):
-            if report.endswith("\n"):
-                report += "\n"
-            else:
-                report += "\n\n"
-        
-        citations_section = "\n\n---\n\n## SOURCES\n\n"
+        # Ensure report ends with proper spacing before adding sections.
+        # The padding joins with the body below instead of being
+        # concatenated onto it, which would copy the whole report again.
+        if report.endswith("\n\n"):
+            padding = ""
+        elif report.endswith("\n"):
+            padding = "\n"
+        else:
+            padding = "\n\n"
+
+
+        # Accumulate fragments and join once: repeated += on a growing string
+        # reallocates quadratically as the sources/authors lists get long.
+        # The optional sub-lines resolve into locals first so each source
+        # contributes exactly one formatted row — one allocation per source
+        # instead of four to seven small appends.
+        citation_parts: List[str] = ["\n\n---\n\n## SOURCES\n\n"]
         for idx, source in enumerate(sources, 1):
-            citations_section += f"[{idx}] {source.get('title', 'Unknown')}\n"
-            if detail_level in {"standard", "detailed"}:
-                if source.get("authors"):
-                    citations_section += f"    Authors: {', '.join(source.get('authors', [])[:3])}\n"
-                citations_section += f"    URL: {source.get('url', 'N/A')}\n"
-                citations_section += f"    Source: {source.get('source_type', 'Unknown')}\n"
-                if detail_level == "detailed":
-                    if source.get("published"):
-                        citations_section += f"    Published: {source.get('published', 'N/A')}\n"
-                    if source.get("citation_count", 0) > 0:
-                        citations_section += f"    Citations: {source.get('citation_count', 0)}\n"
-            citations_section += "\n"
+            get = source.get
+            if detail_level not in {"standard", "detailed"}:
+                citation_parts.append(f"[{idx}] {get('title', 'Unknown')}\n\n")
+                continue
+
+            authors = get("authors")
+            authors_line = f"    Authors: {', '.join(authors[:3])}\n" if authors else ""
+
+            detail_lines = ""
+            if detail_level == "detailed":
+                published = get("published")
+                if published:
+                    detail_lines = f"    Published: {published}\n"
+                citation_count = get("citation_count", 0)
+                if citation_count > 0:
+                    detail_lines += f"    Citations: {citation_count}\n"
+
+            citation_parts.append(
+                f"[{idx}] {get('title', 'Unknown')}\n"
+                f"{authors_line}"
+                f"    URL: {get('url', 'N/A')}\n"
+                f"    Source: {get('source_type', 'Unknown')}\n"
+                f"{detail_lines}\n"
+            )
 
+        contradiction_parts: List[str] = []
         if contradictions:
-            report += "\n\n---\n\n## CONFLICTING EVIDENCE\n\n"
-            for contradiction in contradictions:
-                report += f"- {contradiction.get('description', '')}\n"
+            contradiction_parts.append("\n\n---\n\n## CONFLICTING EVIDENCE\n\n")
+            contradiction_parts.extend(
+                f"- {contradiction.get('description', '')}\n" for contradiction in contradictions
+            )
 
-        return report + citations_section
+        return "".join([report, padding, *contradiction_parts, *citation_parts])
 
     @staticmethod
     def create_citation_map(sources: List) -> CitationMap:
         """Build a citation map from validated sources."""
 
         citation_map = CitationMap()
-        citation_map.total_sources = len(sources)
+        if not sources:
+            return citation_map
 
-        for source in sources:
-            source_type = source.get("source_type", "unknown")
-            citation_map.by_type[source_type] = citation_map.by_type.get(source_type, 0) + 1
-
-            published = str(source.get("published", ""))
-            if published:
-                year = published.split("-")[0]
-                citation_map.by_year[year] = citation_map.by_year.get(year, 0) + 1
+        citation_map.total_sources = len(sources)
 
+        # One pass accumulates all three aggregates; defaultdict drops the
+        # get-then-store probe per key.
+        by_type: Dict[str, int] = defaultdict(int)
+        by_year: Dict[str, int] = defaultdict(int)
         # Include all sources, not just those with citation_count > 0
         # This ensures all sources from the report appear in top_cited
         # Format: [(title, citation_count, url), ...]
-        cited = [
-            (
-                source.get("title", ""),
-                source.get("citation_count", 0) or 0,
-                source.get("url", "") or ""
+        cited = []
+        any_cited = False
+
+        for source in sources:
+            # Five field reads per source; one bound method halves the
+            # attribute lookups.
+            get = source.get
+            by_type[get("source_type", "unknown")] += 1
+
+            published = str(get("published", ""))
+            if published:
+                by_year[published.split("-")[0]] += 1
+
+            citation_count = get("citation_count", 0) or 0
+            cited.append(
+                (
+                    get("title", ""),
+                    citation_count,
+                    get("url", "") or "",
+                )
             )
-            for source in sources
-        ]
-        # Sort by citation count (descending), then by title (ascending) for sources with same count
-        cited.sort(key=lambda item: (-item[1], item[0]))
+            any_cited = any_cited or citation_count > 0
+
+        citation_map.by_type = dict(by_type)
+        citation_map.by_year = dict(by_year)
+        # Sort by citation count (descending), then by title (ascending) for
+        # sources with same count. Two stable passes with C-level itemgetter
+        # keys replace a Python lambda building a tuple per comparison. The
+        # title pass always runs — when every count is zero it alone decides
+        # the order — but the count pass is skipped when it could not move
+        # anything.
+        cited.sort(key=itemgetter(0))
+        if any_cited:
+            cited.sort(key=itemgetter(1), reverse=True)
         citation_map.top_cited = cited  # Return all sources, not just top 10
 
         return citation_map
@@ -248,7 +319,7 @@ class ReporterAgent:
                     "type": "knowledge_graph",
                     "title": "Research Knowledge Graph",
                     "description": f"{len(state.knowledge_graph.nodes)} nodes",
-                    "data": state.knowledge_graph.dict(),
+                    "data": state.knowledge_graph.model_dump(),
                 }
             )
 
@@ -257,7 +328,7 @@ class ReporterAgent:
                 {
                     "type": "citation_distribution",
                     "title": "Source Distribution",
-                    "data": state.citation_map.dict(),
+                    "data": state.citation_map.model_dump(),
                 }
             )
 
@@ -280,10 +351,19 @@ class ReporterAgent:
 
         logger.info("Reporter: compiling artefacts")
 
-        executive_summary = self.generate_executive_summary(state)
-        detailed_report = self.generate_detailed_report(state)
-        citation_map = self.create_citation_map(state.validated_sources)
-        visualisations = self.generate_visualisations(state)
+        # The summary and the detailed report are independent LLM round
+        # trips; overlapping them caps the reporting phase at the slower of
+        # the two instead of their sum. The local artefacts are built while
+        # the network calls are in flight.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summary_future = executor.submit(self.generate_executive_summary, state)
+            report_future = executor.submit(self.generate_detailed_report, state)
+
+            citation_map = self.create_citation_map(state.validated_sources)
+            visualisations = self.generate_visualisations(state)
+
+            executive_summary = summary_future.result()
+            detailed_report = report_future.result()
 
         logger.info(
             "Reporter: generated report (%d chars), %d visuals",
@@ -3,8 +3,14 @@ Synthesis Agent - extracts insights, knowledge graphs, and gaps from validated s
 """
 from __future__ import annotations
 
+import hashlib
+import json
+import re
+import time
 from collections import defaultdict
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from src.agents.state import (
     Contradiction,
@@ -15,9 +21,32 @@ from src.agents.state import (
     ResearchSource,
     ResearchState,
 )
-from src.config import ResearchDepthConfig
+from src.config import ResearchDepthConfig, get_config
 from src.utils.logger import default_logger as logger
 
+# Stage checkpoints expire after a day, like the discovery search cache.
+_CHECKPOINT_TTL = 24 * 3600
+
+# Sentiment term scans for detect_contradictions, compiled once. The word
+# boundaries matter as much as the speed: the old per-term substring
+# checks let "no" match inside "note" and "innovation". Alternatives are
+# ordered by how often they appear in research abstracts so the engine
+# settles on the common case first.
+_POSITIVE_RE = re.compile(r"\b(?:improve|effective|increase|enhance|successful)\b", re.IGNORECASE)
+_NEGATIVE_RE = re.compile(r"\b(?:not|no|without|poor|decrease|fails)\b", re.IGNORECASE)
+
+# Anchored intro-phrase stripper for concept extraction: matches leading
+# boilerplate like "Here are 15 key technical concepts ...:", "The key
+# concepts are:" or "Concepts:" and removes it in one pass.
+_INTRO_RE = re.compile(
+    r"^\s*(?:here are[^:\n]*:|(?:the )?key concepts(?: are)?\s*:|concepts\s*:)\s*",
+    re.IGNORECASE,
+)
+
+# Concept-id normalisation table: spaces and hyphens to underscores in a
+# single translate pass instead of two chained replace copies.
+_ID_TABLE = str.maketrans({" ": "_", "-": "_"})
+
 
 class SynthesisAgent:
     """Agent responsible for synthesising research findings."""
@@ -25,6 +54,35 @@ class SynthesisAgent:
     def __init__(self, llm, depth_config: ResearchDepthConfig | None = None):
         self.llm = llm
         self.depth_config = depth_config
+        self._checkpoint_dir = get_config().cache_dir / "synthesis"
+        self._checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    def _checkpoint_path(self, key: str, stage: str) -> Path:
+        return self._checkpoint_dir / f"{key}_{stage}.json"
+
+    def _load_checkpoint(self, key: str, stage: str) -> Optional[Any]:
+        """Return a fresh-enough checkpointed stage result, if one exists."""
+
+        path = self._checkpoint_path(key, stage)
+        try:
+            if path.exists() and time.time() - path.stat().st_mtime < _CHECKPOINT_TTL:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                logger.info("Synthesis: resumed %s stage from checkpoint", stage)
+                return payload
+        except (OSError, ValueError) as exc:  # pragma: no cover - defensive
+            logger.warning("Synthesis checkpoint read failed for %s: %s", path.name, exc)
+        return None
+
+    def _store_checkpoint(self, key: str, stage: str, payload: Any) -> None:
+        """Persist a completed stage result; empty results stay unsaved."""
+
+        if not payload:
+            return
+        path = self._checkpoint_path(key, stage)
+        try:
+            path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        except OSError as exc:  # pragma: no cover - defensive
+            logger.warning("Synthesis checkpoint write failed for %s: %s", path.name, exc)
 
     def extract_key_concepts(self, sources: List[ResearchSource], query: str = "") -> List[str]:
         """Identify key concepts across validated sources."""
@@ -39,61 +97,30 @@ class SynthesisAgent:
             f"{source.get('title', '')} {source.get('summary', '')[:200]}" for source in sources[:max_sources]
         )
         query_context = f" related to '{query}'" if query else ""
+        # Instructions first, volatile source text last: providers cache
+        # shared prompt prefixes, and the snippets are the part that
+        # changes between calls.
         prompt = (
             f"Extract {max_concepts} key technical concepts{query_context} from the following research snippets.\n"
             f"{'IMPORTANT: Only extract concepts that are directly relevant to the research topic. ' if query else ''}"
-            f"{combined_text}\n"
-            "Return ONLY a comma-separated list of concepts, without any introductory text or explanation."
+            "Return ONLY a comma-separated list of concepts, without any introductory text or explanation.\n\n"
+            f"Snippets:\n{combined_text}"
         )
 
         try:
             response = self.llm.invoke(prompt)
-            content = response.content.strip()
-            
-            # Remove common intro phrases that LLM might add
-            intro_phrases = [
-                "Here are",
-                "The key concepts are",
-                "Key concepts:",
-                "Concepts:",
-                "Here are the key concepts:",
-                "Here are 15 key technical concepts extracted from the research snippets:",
-                "Here are the technical concepts:",
-            ]
-            
-            for phrase in intro_phrases:
-                if content.lower().startswith(phrase.lower()):
-                    # Find the colon after the phrase
-                    colon_idx = content.find(":")
-                    if colon_idx != -1:
-                        content = content[colon_idx + 1:].strip()
-                    else:
-                        # If no colon, try to find where the list starts
-                        words = phrase.split()
-                        for word in words:
-                            if word.lower() in content.lower():
-                                idx = content.lower().find(word.lower())
-                                content = content[idx + len(word):].strip()
-                                if content.startswith(":"):
-                                    content = content[1:].strip()
-                    break
-            
+            # One anchored substitution replaces the old loop over seven
+            # intro phrases with its per-phrase lowercasing and ad-hoc
+            # colon hunting.
+            content = _INTRO_RE.sub("", response.content.strip())
+
             # Split by comma and clean up
             concepts = []
             for concept in content.split(","):
-                concept = concept.strip()
-                # Remove any remaining intro text
-                if concept and not any(phrase.lower() in concept.lower() for phrase in intro_phrases):
-                    # Remove common prefixes
-                    concept = concept.lstrip("- •*").strip()
-                    if concept:
-                        concepts.append(concept)
-            
-            max_concepts = (
-                self.depth_config.max_concepts
-                if self.depth_config
-                else 15
-            )
+                concept = concept.strip().lstrip("- •*").strip()
+                if concept:
+                    concepts.append(concept)
+
             logger.info("Synthesis: extracted %d concepts", len(concepts))
             return concepts[:max_concepts]
         except Exception as exc:  # pylint: disable=broad-except
@@ -117,9 +144,9 @@ class SynthesisAgent:
             f"Identify consensus findings SPECIFICALLY about '{query}' from the following summaries.\n"
             f"IMPORTANT: Only include findings that are DIRECTLY related to '{query}'. "
             f"Exclude any information about unrelated topics (e.g., if query is about mental health, "
-            f"do NOT include findings about financial data, unless they are specifically about mental health AND finance).\n\n"
-            f"Summaries:\n{summaries}\n\n"
-            f"List {max_findings} findings prefixed with '-'. Each finding must be directly relevant to '{query}'."
+            f"do NOT include findings about financial data, unless they are specifically about mental health AND finance).\n"
+            f"List {max_findings} findings prefixed with '-'. Each finding must be directly relevant to '{query}'.\n\n"
+            f"Summaries:\n{summaries}"
         )
 
         try:
@@ -138,18 +165,16 @@ class SynthesisAgent:
     def detect_contradictions(self, sources: List[ResearchSource]) -> List[Contradiction]:
         """Detect contradictory evidence using simple heuristics."""
 
-        positive_terms = {"improve", "enhance", "effective", "successful", "increase"}
-        negative_terms = {"not", "no", "without", "fails", "decrease", "poor"}
-
         positive_sources: List[str] = []
         negative_sources: List[str] = []
 
         for source in sources:
-            text = f"{source.get('title', '').lower()} {source.get('summary', '').lower()}"
-            if any(term in text for term in positive_terms):
-                positive_sources.append(source.get("title", ""))
-            if any(term in text for term in negative_terms):
-                negative_sources.append(source.get("title", ""))
+            title = source.get("title", "")
+            text = f"{title} {source.get('summary', '')}"
+            if _POSITIVE_RE.search(text):
+                positive_sources.append(title)
+            if _NEGATIVE_RE.search(text):
+                negative_sources.append(title)
 
         contradictions: List[Contradiction] = []
         if positive_sources and negative_sources:
@@ -179,8 +204,8 @@ class SynthesisAgent:
         )
         prompt = (
             f"Given the following key concepts, identify {max_gaps} research gaps.\n"
-            f"Concepts: {', '.join(concepts[:10])}\n"
-            "Format each gap as:\nGAP: <name>\nWHY: <importance>\n---"
+            "Format each gap as:\nGAP: <name>\nWHY: <importance>\n---\n\n"
+            f"Concepts: {', '.join(concepts[:10])}"
         )
 
         try:
@@ -213,6 +238,11 @@ class SynthesisAgent:
     def build_knowledge_graph(self, sources: List[ResearchSource], concepts: List[str]) -> KnowledgeGraph:
         """Construct a simple knowledge graph from concepts and sources."""
 
+        # Locally bound constructors skip the repeated global lookups in the
+        # loops below, and extend with a generator batches the appends.
+        Node = KnowledgeGraphNode
+        Edge = KnowledgeGraphEdge
+
         nodes: List[KnowledgeGraphNode] = []
         edges: List[KnowledgeGraphEdge] = []
 
@@ -225,66 +255,101 @@ class SynthesisAgent:
         for concept in concepts[:max_concepts]:
             if len(concept.strip()) <= 2:
                 continue
-            concept_id = concept.lower().replace(" ", "_").replace("-", "_")
+            concept_id = concept.lower().translate(_ID_TABLE)
             concept_ids[concept_id] = concept
-            nodes.append(
-                KnowledgeGraphNode(id=concept_id, label=concept, type="concept")
-            )
 
-        for source in sources[:10]:
-            nodes.append(
-                KnowledgeGraphNode(
-                    id=source.get("id", ""),
-                    label=source.get("title", "")[:60],
-                    type="source",
-                    url=source.get("url", ""),
-                )
+        nodes.extend(
+            Node(id=concept_id, label=concept, type="concept")
+            for concept_id, concept in concept_ids.items()
+        )
+
+        top_sources = sources[:10]
+        nodes.extend(
+            Node(
+                id=source.get("id", ""),
+                label=source.get("title", "")[:60],
+                type="source",
+                url=source.get("url", ""),
             )
+            for source in top_sources
+        )
 
-        for source in sources[:10]:
-            text = f"{source.get('title', '').lower()} {source.get('summary', '').lower()}"
+        # One matching pass per source feeds both edge builders. The
+        # lowered labels and their long words are precomputed once instead
+        # of being re-split for every (source, concept) pair, and each
+        # source text is lowered and scanned a single time; full-label hits
+        # drive co-occurrence, label-or-word hits drive discusses edges.
+        concept_terms = [
+            (concept_id, label.lower(), [word for word in label.lower().split() if len(word) > 3])
+            for concept_id, label in concept_ids.items()
+        ]
+        ordinal = {concept_id: index for index, concept_id in enumerate(concept_ids)}
+
+        # Per-source full-label hits as a bitmask over concept ordinals —
+        # at most ~30 concepts, so one int per source replaces a list of id
+        # strings and the pair keys below become cheap int tuples.
+        masks: List[int] = []
+        for source in top_sources:
+            # One .get per field per source; the edge appends below reuse
+            # the bound id instead of re-probing the model.
+            get = source.get
+            source_id = get("id", "")
+            text = f"{get('title', '').lower()} {get('summary', '').lower()}"
+            mask = 0
             added = False
-            for concept_id, concept_label in concept_ids.items():
-                words = concept_label.lower().split()
-                if concept_label.lower() in text or any(
-                    word in text for word in words if len(word) > 3
-                ):
+            for concept_id, lowered_label, long_words in concept_terms:
+                if lowered_label in text:
+                    mask |= 1 << ordinal[concept_id]
+                    matched = True
+                else:
+                    matched = any(word in text for word in long_words)
+                if matched:
                     edges.append(
-                        KnowledgeGraphEdge(
-                            source=source.get("id", ""),
+                        Edge(
+                            source=source_id,
                             target=concept_id,
                             relation="discusses",
                         )
                     )
                     added = True
+            masks.append(mask)
             if not added and concept_ids:
                 first_concept = next(iter(concept_ids))
                 edges.append(
-                    KnowledgeGraphEdge(
-                        source=source.get("id", ""),
+                    Edge(
+                        source=source_id,
                         target=first_concept,
                         relation="mentions",
                     )
                 )
 
-        cooccurrence: Dict[tuple[str, str], set[str]] = defaultdict(set)
-        for source in sources[:10]:
-            text = f"{source.get('title', '').lower()} {source.get('summary', '').lower()}"
-            mentioned = [
-                concept_id
-                for concept_id, label in concept_ids.items()
-                if label.lower() in text
-            ]
-            for i, c1 in enumerate(mentioned):
-                for c2 in mentioned[i + 1 :]:
-                    key = tuple(sorted((c1, c2)))
-                    cooccurrence[key].add(source.get("id", ""))
-
-        for (c1, c2), support in cooccurrence.items():
-            if len(support) >= 2:
-                edges.append(
-                    KnowledgeGraphEdge(source=c1, target=c2, relation="related_to")
-                )
+        # A source contributes each pair once, so counting sources per pair
+        # replaces the old dict of source-id sets. A pair needs two sources
+        # with two concepts each to reach the support threshold, i.e. at
+        # least four set bits overall — sparser mention sets cannot produce
+        # a related_to edge, so the pair loop is skipped outright.
+        if sum(mask.bit_count() for mask in masks) >= 4:
+            pair_counts: Dict[tuple[int, int], int] = defaultdict(int)
+            for mask in masks:
+                bits: List[int] = []
+                while mask:
+                    low = mask & -mask
+                    bits.append(low.bit_length() - 1)
+                    mask ^= low
+                for i, first in enumerate(bits):
+                    for second in bits[i + 1 :]:
+                        pair_counts[(first, second)] += 1
+
+            concept_id_list = list(concept_ids)
+            for (first, second), count in pair_counts.items():
+                if count >= 2:
+                    edges.append(
+                        Edge(
+                            source=concept_id_list[first],
+                            target=concept_id_list[second],
+                            relation="related_to",
+                        )
+                    )
 
         graph = KnowledgeGraph(
             nodes=nodes,
@@ -316,11 +381,54 @@ class SynthesisAgent:
                 "conflicts_detected": [],
             }
 
-        concepts = self.extract_key_concepts(sources, state.query)
-        consensus = self.find_consensus(sources, state.query)
-        contradictions = self.detect_contradictions(sources)
-        gaps = self.identify_research_gaps(concepts)
-        knowledge_graph = self.build_knowledge_graph(sources, concepts)
+        # A failed or interrupted run should not repeat the LLM stages that
+        # already finished, so each one checkpoints its result to disk
+        # keyed on the query plus the validated source-id set; on retry the
+        # completed stages reload and only the missing ones hit the LLM.
+        checkpoint_key = hashlib.blake2b(
+            "|".join([state.query, *sorted(source.get("id", "") for source in sources)]).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+
+        def concepts_stage() -> List[str]:
+            cached = self._load_checkpoint(checkpoint_key, "concepts")
+            if cached is not None:
+                return cached
+            result = self.extract_key_concepts(sources, state.query)
+            self._store_checkpoint(checkpoint_key, "concepts", result)
+            return result
+
+        def consensus_stage() -> List[str]:
+            cached = self._load_checkpoint(checkpoint_key, "consensus")
+            if cached is not None:
+                return cached
+            result = self.find_consensus(sources, state.query)
+            self._store_checkpoint(checkpoint_key, "consensus", result)
+            return result
+
+        def gaps_stage(concepts: List[str]) -> List[ResearchGap]:
+            cached = self._load_checkpoint(checkpoint_key, "gaps")
+            if cached is not None:
+                return [ResearchGap(**item) for item in cached]
+            result = self.identify_research_gaps(concepts)
+            self._store_checkpoint(checkpoint_key, "gaps", [gap.model_dump() for gap in result])
+            return result
+
+        # Concept extraction, consensus finding, and contradiction detection
+        # are mutually independent, so the two LLM round-trips overlap each
+        # other (and the local heuristic scan) instead of running back to
+        # back. Gap identification and the knowledge graph both need the
+        # concepts, so they form a second overlapped stage.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            concepts_future = executor.submit(concepts_stage)
+            consensus_future = executor.submit(consensus_stage)
+            contradictions = self.detect_contradictions(sources)
+            concepts = concepts_future.result()
+
+            gaps_future = executor.submit(gaps_stage, concepts)
+            knowledge_graph = self.build_knowledge_graph(sources, concepts)
+            consensus = consensus_future.result()
+            gaps = gaps_future.result()
 
         return {
             "key_concepts": concepts,
@@ -328,5 +436,8 @@ class SynthesisAgent:
             "contradictions": contradictions,
             "research_gaps": gaps,
             "knowledge_graph": knowledge_graph,
-            "conflicts_detected": contradictions,
+            # conflicts_detected is typed List[Dict] on ResearchState, so the
+            # models must be dumped here; handing LangGraph the instances
+            # fails its per-node validation of the state update.
+            "conflicts_detected": [contradiction.model_dump() for contradiction in contradictions],
         }
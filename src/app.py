@@ -256,10 +256,12 @@ with tab2:
         # Convert ResearchState (Pydantic model) to dict if needed
         def convert_to_dict(obj):
             """Recursively convert Pydantic models and other objects to dicts."""
-            if hasattr(obj, 'dict'):
+            if hasattr(obj, 'model_dump_json'):
+                # pydantic-core serializes the whole nested model in Rust;
+                # much faster than walking it field by field in Python
+                return json.loads(obj.model_dump_json())
+            elif hasattr(obj, 'dict'):
                 return obj.dict()
-            elif hasattr(obj, 'model_dump'):
-                return obj.model_dump()
             elif isinstance(obj, dict):
                 return {k: convert_to_dict(v) for k, v in obj.items()}
             elif isinstance(obj, list):
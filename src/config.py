@@ -4,12 +4,15 @@ Application configuration management for the Multi-Agent Research System.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+if TYPE_CHECKING:
+    from langchain_groq import ChatGroq
 
 # Load environment variables from .env if present
 load_dotenv()
@@ -18,10 +21,13 @@ load_dotenv()
 class LLMConfig(BaseModel):
     """Configuration for the primary LLM provider."""
 
+    model_config = ConfigDict(frozen=True)
+
     api_key: str
     model_name: str = Field(default="llama-3.1-8b-instant")
     temperature: float = Field(default=0.3, ge=0.0, le=2.0)
     max_tokens: int = Field(default=4000, ge=1, le=32000)
+    max_parallel_llm: int = Field(default=8, ge=1, le=32)
 
     @field_validator("api_key")
     @classmethod
@@ -34,6 +40,8 @@ class LLMConfig(BaseModel):
 class SearchConfig(BaseModel):
     """External search API configuration."""
 
+    model_config = ConfigDict(frozen=True)
+
     tavily_key: Optional[str] = None
     max_arxiv_results: int = Field(default=8, ge=1, le=50)
     max_web_results: int = Field(default=8, ge=1, le=50)
@@ -44,6 +52,8 @@ class SearchConfig(BaseModel):
 class LoggingConfig(BaseModel):
     """Logging preferences for the pipeline."""
 
+    model_config = ConfigDict(frozen=True)
+
     log_level: str = Field(default="INFO")
     log_file: Optional[str] = Field(default="logs/research_pipeline.log")
     console_output: bool = Field(default=True)
@@ -61,6 +71,8 @@ class LoggingConfig(BaseModel):
 class ResearchDepthConfig(BaseModel):
     """Configuration for research depth levels (quick, standard, deep)."""
 
+    model_config = ConfigDict(frozen=True)
+
     # Discovery settings
     max_arxiv_results: int = Field(ge=1, le=50)
     max_web_results: int = Field(ge=1, le=50)
@@ -85,10 +97,17 @@ class ResearchDepthConfig(BaseModel):
     @classmethod
     def get_depth_config(cls, depth: str) -> "ResearchDepthConfig":
         """Get configuration for a specific research depth level."""
-        depth_lower = depth.lower()
-        
+        return cls._build_depth_config(depth.lower())
+
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _build_depth_config(cls, depth_lower: str) -> "ResearchDepthConfig":
+        # The three presets are hard-coded literals that already satisfy every
+        # field constraint, so model_construct skips the (pointless) schema
+        # validation and lru_cache hands back the same instance per depth.
+        # Callers treat depth configs as read-only, so sharing is safe.
         if depth_lower == "quick":
-            return cls(
+            return cls.model_construct(
                 max_arxiv_results=3,
                 max_web_results=3,
                 max_semantic_scholar_results=2,
@@ -102,7 +121,7 @@ class ResearchDepthConfig(BaseModel):
                 max_sources_in_report=5,
             )
         elif depth_lower == "deep":
-            return cls(
+            return cls.model_construct(
                 max_arxiv_results=15,
                 max_web_results=12,
                 max_semantic_scholar_results=10,
@@ -116,7 +135,7 @@ class ResearchDepthConfig(BaseModel):
                 max_sources_in_report=20,
             )
         else:  # standard (default)
-            return cls(
+            return cls.model_construct(
                 max_arxiv_results=8,
                 max_web_results=8,
                 max_semantic_scholar_results=5,
@@ -141,31 +160,56 @@ class ResearchConfig(BaseModel):
     output_dir: Path = Field(default=Path("./outputs"))
     reports_dir: Path = Field(default=Path("./reports"))
     visualisations_dir: Path = Field(default=Path("./visualisations"))
+    cache_dir: Path = Field(default=Path("./cache"))
+
+    _llm_client: "Optional[ChatGroq]" = PrivateAttr(default=None)
 
     @classmethod
     def from_env(cls) -> "ResearchConfig":
         """Construct configuration from environment variables."""
 
-        llm_config = LLMConfig(
-            api_key=os.getenv("GROQ_API_KEY", ""),
-            model_name=os.getenv("MODEL_NAME", "llama-3.1-8b-instant"),
-            temperature=float(os.getenv("TEMPERATURE", 0.3)),
-            max_tokens=int(os.getenv("MAX_TOKENS", 4000)),
-        )
+        # One local binding instead of ten os.getenv calls, each of which
+        # re-resolves the environ mapping through posixmodule.
+        env = os.environ
 
-        search_config = SearchConfig(
-            tavily_key=os.getenv("TAVILY_KEY"),
-            max_arxiv_results=int(os.getenv("MAX_ARXIV_RESULTS", 8)),
-            max_web_results=int(os.getenv("MAX_WEB_RESULTS", 8)),
-            max_semantic_scholar_results=int(os.getenv("MAX_SEMANTIC_SCHOLAR_RESULTS", 5)),
-            semantic_scholar_timeout=int(os.getenv("SEMANTIC_SCHOLAR_TIMEOUT", 10)),
+        llm_config = LLMConfig(
+            api_key=env.get("GROQ_API_KEY", ""),
+            model_name=env.get("MODEL_NAME", "llama-3.1-8b-instant"),
+            temperature=float(env.get("TEMPERATURE", 0.3)),
+            max_tokens=int(env.get("MAX_TOKENS", 4000)),
+            max_parallel_llm=int(env.get("MAX_PARALLEL_LLM", 8)),
         )
 
-        logging_config = LoggingConfig(
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            log_file=os.getenv("LOG_FILE", "logs/research_pipeline.log"),
-            console_output=os.getenv("CONSOLE_OUTPUT", "true").lower() == "true",
+        # Env values are untrusted and get full validation, but when none of
+        # a section's variables are set the field defaults are known-valid,
+        # so model_construct skips the pointless validation pass.
+        search_env = (
+            "TAVILY_KEY",
+            "MAX_ARXIV_RESULTS",
+            "MAX_WEB_RESULTS",
+            "MAX_SEMANTIC_SCHOLAR_RESULTS",
+            "SEMANTIC_SCHOLAR_TIMEOUT",
         )
+        if any(key in env for key in search_env):
+            search_config = SearchConfig(
+                tavily_key=env.get("TAVILY_KEY"),
+                max_arxiv_results=int(env.get("MAX_ARXIV_RESULTS", 8)),
+                max_web_results=int(env.get("MAX_WEB_RESULTS", 8)),
+                max_semantic_scholar_results=int(env.get("MAX_SEMANTIC_SCHOLAR_RESULTS", 5)),
+                semantic_scholar_timeout=int(env.get("SEMANTIC_SCHOLAR_TIMEOUT", 10)),
+            )
+        else:
+            search_config = SearchConfig.model_construct()
+
+        logging_env = ("LOG_LEVEL", "LOG_FILE", "CONSOLE_OUTPUT")
+        if any(key in env for key in logging_env):
+            logging_config = LoggingConfig(
+                log_level=env.get("LOG_LEVEL", "INFO"),
+                log_file=env.get("LOG_FILE", "logs/research_pipeline.log"),
+                console_output=env.get("CONSOLE_OUTPUT", "true").lower() == "true",
+            )
+        else:
+            logging_config = LoggingConfig.model_construct()
 
         config = cls(
             llm=llm_config,
@@ -178,18 +222,32 @@ class ResearchConfig(BaseModel):
     def _prepare_directories(self) -> None:
         """Ensure output directories exist."""
 
-        for directory in (self.output_dir, self.reports_dir, self.visualisations_dir):
-            directory.mkdir(parents=True, exist_ok=True)
-
-    def get_llm(self) -> ChatGroq:
-        """Return a configured ChatGroq client."""
-
-        return ChatGroq(
-            api_key=self.llm.api_key,
-            model=self.llm.model_name,
-            temperature=self.llm.temperature,
-            max_tokens=self.llm.max_tokens,
-        )
+        for directory in (self.output_dir, self.reports_dir, self.visualisations_dir, self.cache_dir):
+            # On warm starts the directories already exist; a single stat is
+            # cheaper than mkdir's internal stat + EEXIST handling.
+            if not directory.is_dir():
+                directory.mkdir(parents=True, exist_ok=True)
+
+    def get_llm(self) -> "ChatGroq":
+        """Return the configured ChatGroq client, creating it on first use.
+
+        The client is stateless apart from its HTTP connection pool, so one
+        instance can be shared by every agent; rebuilding it per call threw
+        away pooled connections and paid the constructor cost each time.
+        """
+
+        if self._llm_client is None:
+            # Deferred: langchain_groq pulls in a multi-MB dependency tree
+            # that config-only importers (tests, scripts) never need.
+            from langchain_groq import ChatGroq
+
+            self._llm_client = ChatGroq(
+                api_key=self.llm.api_key,
+                model=self.llm.model_name,
+                temperature=self.llm.temperature,
+                max_tokens=self.llm.max_tokens,
+            )
+        return self._llm_client
 
     def summary(self) -> str:
         """Human readable summary of the active configuration."""
@@ -200,4 +258,13 @@ class ResearchConfig(BaseModel):
         )
 
 
-config = ResearchConfig.from_env()
+@lru_cache(maxsize=1)
+def get_config() -> ResearchConfig:
+    """Return the process-wide configuration, built lazily on first use.
+
+    Building it at import time ran dotenv loading, env parsing, Pydantic
+    validation and three mkdirs before any caller needed the object, which
+    taxed every ``import src.config`` (including test collection).
+    """
+
+    return ResearchConfig.from_env()
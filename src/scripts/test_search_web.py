@@ -32,7 +32,7 @@ logger = logging.getLogger(__name__)
 # 1. ĐỊNH NGHĨA LỚP DATA TƯƠNG TỰ
 # Đây là một bản sao đơn giản của lớp ResearchSource
 # chỉ chứa các trường mà hàm search_web sử dụng.
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchSource:
     id: str
     title: str
@@ -78,8 +78,9 @@ def search_web_standalone(
                 )
                 continue
             
-            # Tạo ID y hệt logic của bạn
-            result_id = f"web_{hashlib.md5(url.encode()).hexdigest()[:8]}"
+            # Tạo ID: blake2b với digest_size=4 cho ra đúng 8 ký tự hex,
+            # nhanh hơn md5 và không phải cắt bớt digest
+            result_id = f"web_{hashlib.blake2b(url.encode('utf-8'), digest_size=4).hexdigest()}"
             content = result.get("content", "")
 
             formatted.append(
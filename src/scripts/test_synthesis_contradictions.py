@@ -0,0 +1,93 @@
+"""
+Run-through of the synthesis contradiction path with a stubbed LLM.
+
+Exercises SynthesisAgent.synthesize on mixed-sentiment sources (one
+positive, one negative assessment) and checks that the returned update
+validates against ResearchState the way LangGraph validates node output —
+in particular that conflicts_detected arrives as plain dicts, not
+Contradiction instances.
+
+Run from the repository root: python src/scripts/test_synthesis_contradictions.py
+"""
+import os
+import sys
+from pathlib import Path
+
+# Make the repository root importable and satisfy config validation before
+# src.config is pulled in transitively.
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from src.agents.state import ResearchSource, ResearchState
+from src.agents.synthesis_agent import SynthesisAgent
+
+
+class _StubResponse:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _StubLLM:
+    """Canned responses shaped like the parsers expect; no network."""
+
+    temperature = 0.0
+
+    def invoke(self, prompt: str) -> _StubResponse:
+        if "comma-separated" in prompt:
+            return _StubResponse("meditation, stress reduction, cortisol levels")
+        return _StubResponse("- Finding one\n- Finding two")
+
+
+def main() -> None:
+    sources = [
+        ResearchSource(
+            id="s1",
+            title="Meditation improves stress outcomes",
+            summary="An eight-week programme was shown to improve and enhance "
+            "stress resilience across cohorts.",
+            source_type="arxiv",
+        ),
+        ResearchSource(
+            id="s2",
+            title="No effect of meditation on cortisol",
+            summary="The trial found no measurable change and the intervention "
+            "fails to outperform the control condition.",
+            source_type="semantic_scholar",
+        ),
+    ]
+    state = ResearchState(query="meditation and stress", validated_sources=sources)
+
+    agent = SynthesisAgent(_StubLLM())
+    updates = agent.synthesize(state)
+
+    conflicts = updates["conflicts_detected"]
+    assert conflicts, "mixed-sentiment sources must yield a contradiction"
+    assert all(isinstance(item, dict) for item in conflicts), (
+        "conflicts_detected must hold plain dicts for the ResearchState schema"
+    )
+
+    # The same coercion LangGraph applies when a node's update re-enters the
+    # typed state: this raised before conflicts were dumped to dicts.
+    merged = ResearchState.model_validate({**state.model_dump(), **_dumpable(updates)})
+    assert merged.conflicts_detected == conflicts
+
+    print(f"--- OK: {len(conflicts)} contradiction(s) passed schema validation ---")
+    print(conflicts[0]["description"])
+
+
+def _dumpable(updates: dict) -> dict:
+    """Mirror pydantic's handling of model-typed update values."""
+
+    out = {}
+    for key, value in updates.items():
+        if hasattr(value, "model_dump"):
+            out[key] = value.model_dump()
+        elif isinstance(value, list):
+            out[key] = [v.model_dump() if hasattr(v, "model_dump") else v for v in value]
+        else:
+            out[key] = value
+    return out
+
+
+if __name__ == "__main__":
+    main()
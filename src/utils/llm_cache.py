@@ -0,0 +1,105 @@
+"""
+Process-wide LLM response cache shared across agents.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict
+
+from src.utils.logger import default_logger as logger
+
+
+class LLMCache:
+    """Caching proxy around a LangChain chat model.
+
+    All agents share one underlying ``llm`` object, and many of their prompts
+    (validation rubrics, reporter templates) repeat within and across runs.
+    Wrapping the model turns those repeat invocations into a hash lookup
+    instead of a network round-trip. Only deterministic calls are cached:
+    when the model samples (``temperature > 0``) responses are not reusable,
+    so the proxy falls through to the wrapped model untouched.
+    """
+
+    def __init__(self, llm: Any, maxsize: int = 2048):
+        self._llm = llm
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _cache_key(self, prompt: Any) -> str:
+        payload = {
+            "model": getattr(self._llm, "model_name", None) or getattr(self._llm, "model", ""),
+            "prompt": prompt if isinstance(prompt, str) else repr(prompt),
+            "temperature": getattr(self._llm, "temperature", None),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _cacheable(self) -> bool:
+        temperature = getattr(self._llm, "temperature", None)
+        return temperature is not None and temperature <= 0.0
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> Any:
+        """Invoke the wrapped model, serving deterministic repeats from cache."""
+
+        if not self._cacheable() or kwargs:
+            return self._llm.invoke(prompt, **kwargs)
+
+        key = self._cache_key(prompt)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return cached
+
+        self._misses += 1
+        response = self._llm.invoke(prompt)
+        self._entries[key] = response
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return response
+
+    async def ainvoke(self, prompt: Any, **kwargs: Any) -> Any:
+        """Async twin of invoke with the same cache semantics."""
+
+        if not self._cacheable() or kwargs:
+            return await self._llm.ainvoke(prompt, **kwargs)
+
+        key = self._cache_key(prompt)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return cached
+
+        self._misses += 1
+        response = await self._llm.ainvoke(prompt)
+        self._entries[key] = response
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for observability."""
+
+        return {"hits": self._hits, "misses": self._misses, "size": len(self._entries)}
+
+    def __getattr__(self, item: str) -> Any:
+        # Delegate everything else (model_name, temperature, bind, ...) to the
+        # wrapped model so agents can treat the proxy as the model itself.
+        return getattr(self._llm, item)
+
+
+def log_cache_stats(llm: Any) -> None:
+    """Log cache statistics if the given llm is an LLMCache proxy."""
+
+    if isinstance(llm, LLMCache):
+        stats = llm.stats()
+        logger.info(
+            "LLM cache: %d hits / %d misses (%d entries)",
+            stats["hits"],
+            stats["misses"],
+            stats["size"],
+        )
@@ -3,11 +3,42 @@ Logging utilities for the Multi-Agent Research System.
 """
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Opt-in fast path: %(funcName)s/%(lineno)d force logging to walk the call
+# stack for every record, and thread/process ids are looked up per record
+# even when unused. FAST_LOG=1 drops those fields and disables the
+# bookkeeping, cutting LogRecord creation cost on logging-heavy runs.
+_FAST_LOG = os.environ.get("FAST_LOG", "").lower() in {"1", "true"}
+if _FAST_LOG:
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
+# One listener per logger name: reconfiguring a logger must stop the old
+# listener thread and close its file handler, otherwise each setup_logger
+# call would leak a thread holding the log file open.
+_queue_listeners: dict[str, QueueListener] = {}
+
+
+def _stop_queue_listeners() -> None:
+    for listener in _queue_listeners.values():
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    _queue_listeners.clear()
+
+
+atexit.register(_stop_queue_listeners)
+
 
 def setup_logger(
     name: str = "multi_agent_research",
@@ -26,17 +57,26 @@ def setup_logger(
     """
 
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger.setLevel(level)
     logger.handlers.clear()
 
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(funcName)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+    previous = _queue_listeners.pop(name, None)
+    if previous is not None:
+        previous.stop()
+        for handler in previous.handlers:
+            handler.close()
+
+    detail_format = (
+        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+        if _FAST_LOG
+        else "%(asctime)s | %(levelname)s | %(name)s | %(funcName)s:%(lineno)d | %(message)s"
     )
+    formatter = logging.Formatter(detail_format, datefmt="%Y-%m-%d %H:%M:%S")
 
     if console_output:
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+        console_handler.setLevel(level)
         console_handler.setFormatter(
             logging.Formatter("%(levelname)s | %(message)s")
         )
@@ -47,9 +87,25 @@ def setup_logger(
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
         file_handler = logging.FileHandler(log_path, encoding="utf-8")
-        file_handler.setLevel(logging.DEBUG)
+        # Match the configured level instead of hard-wiring DEBUG: records
+        # below the logger's level never reach handlers anyway, and a DEBUG
+        # handler level only invited formatting cost the moment anyone
+        # lowered the logger level for one noisy module.
+        file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        # Decouple callers from disk: the producer side only enqueues the
+        # record, while a background listener thread owns the FileHandler
+        # and its write() syscalls (and the file lock that serialised the
+        # agents' concurrent logging).
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
+
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _queue_listeners[name] = listener
 
     logger.debug("Logger initialised: %s", name)
     return logger
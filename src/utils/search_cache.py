@@ -0,0 +1,61 @@
+"""
+On-disk TTL cache for external search provider responses.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+from src.utils.logger import default_logger as logger
+
+
+class SearchCache:
+    """Small JSON-file cache keyed on (provider, query, limit).
+
+    Discovery re-queries the same providers for the same query across runs,
+    yet arXiv updates at most daily and scholarly metadata barely moves
+    within hours. Serving repeats from disk removes the network call
+    entirely; entries expire after a per-provider TTL chosen by the caller.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, provider: str, query: str, limit: Any) -> Path:
+        key = hashlib.blake2s(f"{query}|{limit}".encode("utf-8"), digest_size=8).hexdigest()
+        return self.cache_dir / f"{provider}_{key}.json"
+
+    def get(self, provider: str, query: str, limit: Any, ttl: int) -> Optional[List[dict]]:
+        """Return the cached payload if present and younger than ttl seconds."""
+
+        path = self._entry_path(provider, query, limit)
+        try:
+            if path.exists() and time.time() - path.stat().st_mtime < ttl:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                self.hits += 1
+                logger.info("Search cache hit: %s (%d items)", path.name, len(payload))
+                return payload
+        except (OSError, ValueError) as exc:  # pragma: no cover - defensive
+            logger.warning("Search cache read failed for %s: %s", path.name, exc)
+        self.misses += 1
+        return None
+
+    def put(self, provider: str, query: str, limit: Any, payload: List[dict]) -> None:
+        """Store a payload for (provider, query, limit)."""
+
+        path = self._entry_path(provider, query, limit)
+        try:
+            path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        except OSError as exc:  # pragma: no cover - defensive
+            logger.warning("Search cache write failed for %s: %s", path.name, exc)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for observability."""
+
+        return {"hits": self.hits, "misses": self.misses}